@@ -5,20 +5,43 @@ from typing import Optional
 
 # Playwright is an optional dependency
 try:
-    from playwright.async_api import async_playwright, Browser, Page, Playwright
+    from playwright.async_api import (
+        async_playwright,
+        Browser,
+        BrowserContext,
+        Page,
+        Playwright,
+    )
     PLAYWRIGHT_AVAILABLE = True
 except ImportError:
     PLAYWRIGHT_AVAILABLE = False
 
+# Chromium flags that cut per-process memory and startup cost
+BROWSER_LAUNCH_ARGS = [
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--no-sandbox",
+    "--disable-extensions",
+]
+
+# Recycle a pooled context after this many fetches to bound memory growth
+BROWSER_POOL_RECYCLE_AFTER = 50
+
 
 class BrowserFetcher:
-    """Fetches pages using a headless browser for JS-rendered content."""
+    """Fetches pages using a headless browser for JS-rendered content.
+
+    Maintains a pool of browser contexts that are checked out per fetch
+    and reused, avoiding the cost of creating a fresh context (a full
+    renderer IPC round-trip) for every page.
+    """
 
     def __init__(
         self,
         headless: bool = True,
         timeout: int = 30000,
         wait_for_idle: bool = True,
+        pool_size: int = 4,
     ):
         if not PLAYWRIGHT_AVAILABLE:
             raise ImportError(
@@ -30,23 +53,55 @@ class BrowserFetcher:
         self.headless = headless
         self.timeout = timeout
         self.wait_for_idle = wait_for_idle
+        self.pool_size = pool_size
         self._playwright: Optional[Playwright] = None
         self._browser: Optional[Browser] = None
+        self._context_pool: Optional["asyncio.Queue[BrowserContext]"] = None
+        self._context_uses: dict[int, int] = {}
 
     async def start(self) -> None:
-        """Start the browser instance."""
+        """Start the browser instance and pre-create the context pool."""
         self._playwright = await async_playwright().start()
         self._browser = await self._playwright.chromium.launch(
             headless=self.headless,
+            args=BROWSER_LAUNCH_ARGS,
         )
 
+        self._context_pool = asyncio.Queue()
+        for _ in range(self.pool_size):
+            context = await self._browser.new_context()
+            self._context_uses[id(context)] = 0
+            await self._context_pool.put(context)
+
     async def stop(self) -> None:
         """Stop the browser instance."""
+        if self._context_pool:
+            while not self._context_pool.empty():
+                context = self._context_pool.get_nowait()
+                try:
+                    await context.close()
+                except Exception:
+                    pass
+            self._context_pool = None
+            self._context_uses.clear()
         if self._browser:
             await self._browser.close()
         if self._playwright:
             await self._playwright.stop()
 
+    async def _checkin_context(self, context: "BrowserContext") -> None:
+        """Return a context to the pool, recycling it if it's worn out."""
+        uses = self._context_uses.pop(id(context), 0) + 1
+        if uses >= BROWSER_POOL_RECYCLE_AFTER:
+            try:
+                await context.close()
+            except Exception:
+                pass
+            context = await self._browser.new_context()
+            uses = 0
+        self._context_uses[id(context)] = uses
+        await self._context_pool.put(context)
+
     async def fetch(self, url: str) -> Optional[str]:
         """Fetch a page and return the rendered HTML.
 
@@ -56,12 +111,13 @@ class BrowserFetcher:
         Returns:
             Rendered HTML content or None if failed
         """
-        if not self._browser:
+        if not self._browser or not self._context_pool:
             raise RuntimeError("Browser not started. Call start() first.")
 
+        context = await self._context_pool.get()
         page: Optional[Page] = None
         try:
-            page = await self._browser.new_page()
+            page = await context.new_page()
 
             # Navigate to the page
             response = await page.goto(
@@ -96,6 +152,7 @@ class BrowserFetcher:
         finally:
             if page:
                 await page.close()
+            await self._checkin_context(context)
 
     async def __aenter__(self) -> "BrowserFetcher":
         await self.start()
@@ -11,6 +11,14 @@ from . import __version__
 from .config import CrawlerConfig
 from .crawler import WebCrawler
 
+# uvloop is an optional dependency; it substantially speeds up the
+# socket-heavy event loop work this crawler does
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
 console = Console()
 
 
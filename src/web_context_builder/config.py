@@ -39,6 +39,7 @@ class CrawlerConfig:
     delay_between_requests: float = 0.1  # seconds
     request_timeout: int = 30  # seconds
     max_retries: int = 3
+    max_page_bytes: int = 5_000_000  # Skip pages whose body exceeds this size
 
     # URL filtering
     stay_on_subdomain: bool = True  # Only crawl same subdomain
@@ -1,23 +1,110 @@
 """Core async web crawler implementation."""
 
 import asyncio
+import json
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from typing import TYPE_CHECKING, Optional, Set
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 
 import aiohttp
+import lxml.html
 import tldextract
-from bs4 import BeautifulSoup
+from lxml import etree
 
 from .config import CrawlerConfig
 from .parser import html_to_markdown
 from .storage import StorageManager
 from .visualizer import CrawlerVisualizer, PageStatus
 
+# hyperscan is an optional dependency that matches all exclude patterns in
+# a single DFA pass instead of one regex scan per alternation
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+# aiodns enables aiohttp's non-blocking AsyncResolver
+try:
+    import aiodns  # noqa: F401
+    AIODNS_AVAILABLE = True
+except ImportError:
+    AIODNS_AVAILABLE = False
+
 if TYPE_CHECKING:
     from .browser import BrowserFetcher
 
 
+# Sentinel returned by _fetch_page when the server answers 304 Not Modified
+_NOT_MODIFIED = object()
+
+
+def _extract_hrefs(html: str, base_url: str) -> list[str]:
+    """Collect candidate anchor hrefs from HTML content.
+
+    Module-level (and free of crawler state) so it can run in a worker
+    process alongside html_to_markdown. Uses lxml's C-implemented
+    iterlinks pass instead of building a BeautifulSoup tree.
+    """
+    try:
+        doc = lxml.html.fromstring(html)
+        doc.make_links_absolute(base_url, resolve_base_href=True)
+    except (etree.ParserError, ValueError):
+        return []
+
+    return [
+        link
+        for element, attr, link, _ in doc.iterlinks()
+        if attr == "href"
+        and element.tag == "a"
+        # Skip empty, javascript, and anchor links
+        and link
+        and not link.startswith(("javascript:", "mailto:", "tel:", "#"))
+    ]
+
+
+@lru_cache(maxsize=65536)
+def _normalize_url(url: str) -> str:
+    """Normalize URL for deduplication.
+
+    Memoized: large sites link to the same nav targets from every page,
+    so repeated normalizations become cache hits. The scan is hand-rolled
+    because only scheme://netloc/path plus a sorted query are needed; a
+    few find/slice operations avoid urlparse's regex and named-tuple
+    machinery on every extracted link.
+    """
+    url = url.lower()
+
+    # Remove fragment
+    fragment = url.find("#")
+    if fragment != -1:
+        url = url[:fragment]
+
+    # Split off the query (re-appended sorted below)
+    query = ""
+    question = url.find("?")
+    if question != -1:
+        url, query = url[:question], url[question + 1:]
+
+    # Locate the start of the path so the root slash can be preserved
+    scheme_end = url.find("://")
+    path_start = url.find("/", scheme_end + 3) if scheme_end != -1 else -1
+
+    # Remove trailing slash unless it's the root
+    if url.endswith("/") and (path_start == -1 or path_start != len(url) - 1):
+        url = url[:-1]
+
+    # Handle query params (keep them but sorted for consistency)
+    if query:
+        params = sorted(query.split("&"))
+        url = f"{url}?{'&'.join(params)}"
+
+    return url
+
+
 class WebCrawler:
     """Production-ready async web crawler."""
 
@@ -31,76 +118,105 @@ class WebCrawler:
         self._seen_urls: Set[str] = set()
         self._url_lock = asyncio.Lock()
 
-        # Domain extraction for filtering
+        # Conditional re-crawl cache persisted in the output directory
+        # between runs: url -> [etag, last_modified] plus, once the page
+        # has been parsed, its filtered outlinks as a third element
+        self._etag_path = config.output_dir / ".etags.json"
+        self._etag_cache: dict[str, list] = {}
+
+        # Domain extraction for filtering (tldextract runs once here; the
+        # per-URL check is a plain hostname comparison)
         self._root_extract = tldextract.extract(config.root_url)
         self._root_parsed = urlparse(config.root_url)
+        self._root_host = (self._root_parsed.hostname or "").lower()
+        self._root_registered = self._root_extract.registered_domain.lower()
+
+        # Compile exclude patterns (file extensions + custom) into a single
+        # alternation regex so each URL is scanned once, not once per pattern
+        exclude_patterns = list(config.exclude_extensions) + list(config.url_exclude_patterns)
+        self._exclude_re = re.compile(
+            "|".join(f"(?:{pattern})" for pattern in exclude_patterns),
+            re.IGNORECASE,
+        ) if exclude_patterns else None
+
+        # Compile the exclude patterns into a hyperscan database when
+        # available; _exclude_re stays as the fallback for patterns using
+        # constructs hyperscan rejects (or when it isn't installed)
+        self._hs_db = None
+        if HYPERSCAN_AVAILABLE and exclude_patterns:
+            try:
+                db = hyperscan.Database()
+                db.compile(
+                    expressions=[p.encode("utf-8") for p in exclude_patterns],
+                    flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH]
+                    * len(exclude_patterns),
+                )
+                self._hs_db = db
+            except Exception:
+                self._hs_db = None
 
-        # Compile file extension exclude patterns
-        self._exclude_extensions = [
-            re.compile(pattern, re.IGNORECASE)
-            for pattern in config.exclude_extensions
-        ]
-
-        # Compile custom URL include patterns (if any, URL must match at least one)
-        self._url_include_patterns = [
-            re.compile(pattern, re.IGNORECASE)
-            for pattern in config.url_include_patterns
-        ] if config.url_include_patterns else []
+        # Custom URL include patterns (if any, URL must match at least one)
+        self._include_re = re.compile(
+            "|".join(f"(?:{pattern})" for pattern in config.url_include_patterns),
+            re.IGNORECASE,
+        ) if config.url_include_patterns else None
 
-        # Compile custom URL exclude patterns
-        self._url_exclude_patterns = [
-            re.compile(pattern, re.IGNORECASE)
-            for pattern in config.url_exclude_patterns
-        ]
+        # Request settings reused across every fetch (and every retry)
+        self._timeout = aiohttp.ClientTimeout(total=config.request_timeout)
+        self._default_headers = {"User-Agent": config.user_agent}
 
         # Semaphore for concurrent requests
         self._semaphore = asyncio.Semaphore(config.max_concurrent)
 
-        # Queue for BFS crawling
-        self._queue: asyncio.Queue[tuple[str, int, Optional[str]]] = asyncio.Queue()
-
-        # Crawling state
-        self._active_tasks = 0
-        self._active_lock = asyncio.Lock()
-        self._finished = asyncio.Event()
-
-    def _normalize_url(self, url: str) -> str:
-        """Normalize URL for deduplication."""
-        parsed = urlparse(url)
-
-        # Remove fragment
-        normalized = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-
-        # Remove trailing slash unless it's the root
-        if normalized.endswith("/") and parsed.path != "/":
-            normalized = normalized[:-1]
+        # Queue for BFS crawling; None is the worker shutdown sentinel
+        self._queue: asyncio.Queue[Optional[tuple[str, int, Optional[str]]]] = (
+            asyncio.Queue()
+        )
 
-        # Handle query params (keep them but sorted for consistency)
-        if parsed.query:
-            params = sorted(parsed.query.split("&"))
-            normalized = f"{normalized}?{'&'.join(params)}"
+        # Memoize per-URL crawl decisions for this crawl; the same nav links
+        # are re-checked on every page that carries them
+        self._should_crawl = lru_cache(maxsize=65536)(self._should_crawl)
 
-        return normalized.lower()
+        # Process pool for CPU-bound parsing/conversion (created per crawl)
+        self._cpu_pool: Optional[ProcessPoolExecutor] = None
 
     def _is_same_domain(self, url: str) -> bool:
         """Check if URL is on the same domain/subdomain."""
         try:
-            parsed = urlparse(url)
-            extract = tldextract.extract(url)
-
-            # Must match registered domain
-            if extract.registered_domain != self._root_extract.registered_domain:
+            host = urlparse(url).hostname
+            if not host:
                 return False
+            host = host.lower()
 
-            # If stay_on_subdomain is True, also check subdomain
-            if self.config.stay_on_subdomain:
-                if extract.subdomain != self._root_extract.subdomain:
-                    return False
+            # Same subdomain means the full hostname must match
+            if self.config.stay_on_subdomain or not self._root_registered:
+                return host == self._root_host
 
-            return True
+            # Otherwise any host under the registered domain is allowed
+            return host == self._root_registered or host.endswith(
+                "." + self._root_registered
+            )
         except Exception:
             return False
 
+    def _matches_exclude(self, url: str) -> bool:
+        """Test the URL against the exclude patterns in one pass."""
+        if self._hs_db is not None:
+            matched = False
+
+            def on_match(pattern_id, start, end, flags, context):
+                nonlocal matched
+                matched = True
+                return hyperscan.HS_SCAN_TERMINATED
+
+            try:
+                self._hs_db.scan(url.encode("utf-8"), match_event_handler=on_match)
+            except hyperscan.ScanTerminated:
+                pass
+            return matched
+
+        return self._exclude_re is not None and self._exclude_re.search(url) is not None
+
     def _should_crawl(self, url: str) -> bool:
         """Determine if a URL should be crawled."""
         # Must be HTTP(S)
@@ -108,66 +224,101 @@ class WebCrawler:
             return False
 
         # Must be same domain (unless custom include patterns override)
-        if not self._url_include_patterns and not self._is_same_domain(url):
+        if self._include_re is None and not self._is_same_domain(url):
             return False
 
-        # Check file extension exclude patterns
-        for pattern in self._exclude_extensions:
-            if pattern.search(url):
-                return False
-
-        # Check custom URL exclude patterns
-        for pattern in self._url_exclude_patterns:
-            if pattern.search(url):
-                return False
+        # Check exclude patterns (file extensions + custom)
+        if self._matches_exclude(url):
+            return False
 
         # If include patterns specified, URL must match at least one
-        if self._url_include_patterns:
-            if not any(pattern.search(url) for pattern in self._url_include_patterns):
-                return False
+        if self._include_re is not None and not self._include_re.search(url):
+            return False
 
         return True
 
-    def _extract_links(self, html: str, base_url: str) -> list[str]:
-        """Extract all links from HTML content."""
-        soup = BeautifulSoup(html, "lxml")
-        links = []
-
-        for a in soup.find_all("a", href=True):
-            href = a["href"]
-
-            # Skip empty, javascript, and anchor links
-            if not href or href.startswith(("javascript:", "mailto:", "tel:", "#")):
-                continue
-
-            # Convert relative URLs to absolute
-            absolute_url = urljoin(base_url, href)
-
-            # Normalize
-            normalized = self._normalize_url(absolute_url)
-
+    def _filter_links(self, hrefs: list[str]) -> list[str]:
+        """Normalize candidate hrefs and keep the crawlable ones."""
+        links = set()
+        for link in hrefs:
+            normalized = _normalize_url(link)
             if self._should_crawl(normalized):
-                links.append(normalized)
+                links.add(normalized)
+        return list(links)
 
-        return list(set(links))  # Deduplicate
+    def _load_etag_cache(self) -> None:
+        """Load the persisted ETag/Last-Modified cache, if any."""
+        try:
+            with open(self._etag_path, encoding="utf-8") as f:
+                self._etag_cache = json.load(f)
+        except (OSError, ValueError):
+            self._etag_cache = {}
+
+    def _save_etag_cache(self) -> None:
+        """Persist the ETag/Last-Modified cache for the next crawl."""
+        try:
+            with open(self._etag_path, "w", encoding="utf-8") as f:
+                json.dump(self._etag_cache, f)
+        except OSError:
+            pass
+
+    async def _fetch_page(
+        self, session: aiohttp.ClientSession, url: str
+    ) -> "str | object | None":
+        """Fetch a single page with retries.
+
+        Sends conditional headers when validators are cached for the URL
+        and returns the _NOT_MODIFIED sentinel on a 304 response, letting
+        the caller skip the parse/save pipeline entirely.
+        """
+        headers = self._default_headers
+        cached = self._etag_cache.get(url)
+        # Only revalidate while the previous run's page file is still on
+        # disk; a 304 with no saved copy would leave the page unrecoverable
+        if cached and self.storage.has_saved_page(url):
+            headers = dict(headers)
+            etag, last_modified = cached[0], cached[1]
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
 
-    async def _fetch_page(self, session: aiohttp.ClientSession, url: str) -> Optional[str]:
-        """Fetch a single page with retries."""
         for attempt in range(self.config.max_retries):
             try:
                 async with session.get(
                     url,
-                    timeout=aiohttp.ClientTimeout(total=self.config.request_timeout),
+                    timeout=self._timeout,
                     allow_redirects=True,
-                    headers={"User-Agent": self.config.user_agent},
+                    headers=headers,
                 ) as response:
+                    if response.status == 304:
+                        return _NOT_MODIFIED
+
                     # Only process HTML content
                     content_type = response.headers.get("Content-Type", "")
                     if "text/html" not in content_type.lower():
                         return None
 
                     if response.status == 200:
-                        return await response.text()
+                        # Bail out early on oversized bodies rather than
+                        # buffering and decoding them wholesale
+                        content_length = response.headers.get("Content-Length", "")
+                        if content_length.isdigit() and int(content_length) > self.config.max_page_bytes:
+                            return None
+
+                        body = bytearray()
+                        async for chunk in response.content.iter_chunked(65536):
+                            body += chunk
+                            if len(body) > self.config.max_page_bytes:
+                                return None
+
+                        etag = response.headers.get("ETag")
+                        last_modified = response.headers.get("Last-Modified")
+                        if etag or last_modified:
+                            self._etag_cache[url] = [etag, last_modified]
+                        return bytes(body).decode(
+                            response.charset or "utf-8", errors="replace"
+                        )
                     elif response.status in (404, 410):
                         return None  # Page doesn't exist
                     else:
@@ -218,7 +369,7 @@ class WebCrawler:
         async with self._semaphore:
             # Update visualizer status
             if self.visualizer:
-                await self.visualizer.update_page(url, PageStatus.CRAWLING)
+                self.visualizer.update_page(url, PageStatus.CRAWLING)
 
             try:
                 # Fetch the page (browser or HTTP)
@@ -227,18 +378,49 @@ class WebCrawler:
                 else:
                     html = await self._fetch_page(session, url)
 
+                if html is _NOT_MODIFIED:
+                    # Unchanged since the last crawl: re-register the saved
+                    # file so it stays in the merged output, and keep the
+                    # frontier growing from the outlinks remembered next to
+                    # the validators
+                    await self.storage.restore_page(url)
+
+                    if self.visualizer:
+                        self.visualizer.update_page(
+                            url, PageStatus.SKIPPED, error="Not modified (304)"
+                        )
+
+                    cached = self._etag_cache.get(url)
+                    cached_links = cached[2] if cached and len(cached) > 2 else []
+                    if self.config.max_depth is None or depth < self.config.max_depth:
+                        for link in cached_links:
+                            await self._maybe_queue_url(link, depth + 1, url)
+                    return
+
                 if html is None:
                     if self.visualizer:
-                        await self.visualizer.update_page(
+                        self.visualizer.update_page(
                             url, PageStatus.SKIPPED, error="Not HTML or fetch failed"
                         )
                     return
 
-                # Extract links
-                links = self._extract_links(html, url)
+                # Parsing and markdown conversion are CPU-bound; run them in
+                # the process pool so they don't stall the network workers
+                loop = asyncio.get_running_loop()
+                hrefs = await loop.run_in_executor(
+                    self._cpu_pool, _extract_hrefs, html, url
+                )
+                links = self._filter_links(hrefs)
 
-                # Convert to markdown
-                markdown = html_to_markdown(html, url)
+                # Remember the outlinks next to the validators so a 304 on
+                # a later run can keep walking them without re-parsing
+                entry = self._etag_cache.get(url)
+                if entry is not None:
+                    entry[2:] = [links]
+
+                markdown = await loop.run_in_executor(
+                    self._cpu_pool, html_to_markdown, html, url
+                )
 
                 # Extract title from markdown
                 title = None
@@ -252,7 +434,7 @@ class WebCrawler:
 
                 # Update visualizer
                 if self.visualizer:
-                    await self.visualizer.update_page(
+                    self.visualizer.update_page(
                         url, PageStatus.SUCCESS, title=title, links_found=len(links)
                     )
 
@@ -267,7 +449,7 @@ class WebCrawler:
 
             except Exception as e:
                 if self.visualizer:
-                    await self.visualizer.update_page(
+                    self.visualizer.update_page(
                         url, PageStatus.FAILED, error=str(e)
                     )
 
@@ -275,48 +457,43 @@ class WebCrawler:
         self, url: str, depth: int, parent_url: Optional[str]
     ) -> bool:
         """Queue a URL if not already seen."""
+        # Lock-free fast path: already-seen is by far the common case on
+        # dense sites, and set reads are atomic under the GIL
+        if url in self._seen_urls:
+            return False
+
         async with self._url_lock:
+            # Re-check under the lock in case another worker won the race
             if url in self._seen_urls:
                 return False
             self._seen_urls.add(url)
 
         # Register with visualizer
         if self.visualizer:
-            await self.visualizer.add_page(url, depth, parent_url)
+            self.visualizer.add_page(url, depth, parent_url)
 
         # Add to queue
         await self._queue.put((url, depth, parent_url))
         return True
 
     async def _worker(self, session: Optional[aiohttp.ClientSession]) -> None:
-        """Worker coroutine that processes URLs from the queue."""
+        """Worker coroutine that processes URLs from the queue.
+
+        Blocks on the queue indefinitely; crawl() retires workers by
+        enqueueing one None sentinel per worker once the queue joins.
+        """
         while True:
-            try:
-                # Wait for URL with timeout
-                try:
-                    url, depth, parent_url = await asyncio.wait_for(
-                        self._queue.get(), timeout=2.0
-                    )
-                except asyncio.TimeoutError:
-                    # Check if we should stop
-                    async with self._active_lock:
-                        if self._active_tasks == 0 and self._queue.empty():
-                            return
-                    continue
-
-                async with self._active_lock:
-                    self._active_tasks += 1
-
-                try:
-                    await self._process_page(session, url, depth, parent_url)
-                finally:
-                    self._queue.task_done()
-                    async with self._active_lock:
-                        self._active_tasks -= 1
-
-            except asyncio.CancelledError:
+            item = await self._queue.get()
+            if item is None:
+                self._queue.task_done()
                 return
 
+            url, depth, parent_url = item
+            try:
+                await self._process_page(session, url, depth, parent_url)
+            finally:
+                self._queue.task_done()
+
     async def crawl(self, show_progress: bool = True) -> int:
         """Start crawling from the root URL.
 
@@ -329,6 +506,13 @@ class WebCrawler:
         # Initialize storage
         await self.storage.initialize()
 
+        # Load cached validators from previous crawls of this output dir
+        self._load_etag_cache()
+
+        # CPU stage runs in separate processes so conversion overlaps with
+        # in-flight network I/O instead of serializing behind the GIL
+        self._cpu_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+
         # Initialize visualizer
         if show_progress:
             self.visualizer = CrawlerVisualizer(
@@ -337,7 +521,7 @@ class WebCrawler:
             await self.visualizer.start()
 
         # Queue the root URL
-        normalized_root = self._normalize_url(self.config.root_url)
+        normalized_root = _normalize_url(self.config.root_url)
         await self._maybe_queue_url(normalized_root, 0, None)
 
         # Initialize browser if needed
@@ -347,6 +531,7 @@ class WebCrawler:
             self._browser = BrowserFetcher(
                 headless=self.config.browser_headless,
                 timeout=self.config.request_timeout * 1000,  # Convert to ms
+                pool_size=self.config.max_concurrent,
             )
             await self._browser.start()
 
@@ -360,12 +545,21 @@ class WebCrawler:
 
                 await self._queue.join()
 
-                for worker in workers:
-                    worker.cancel()
-                await asyncio.gather(*workers, return_exceptions=True)
+                # All pages processed; retire the workers
+                for _ in workers:
+                    self._queue.put_nowait(None)
+                await asyncio.gather(*workers)
             else:
-                # HTTP mode: use aiohttp session
-                connector = aiohttp.TCPConnector(limit=self.config.max_concurrent * 2)
+                # HTTP mode: use aiohttp session. Keep-alive connections are
+                # concentrated on the crawled host, DNS answers are cached,
+                # and resolution goes through c-ares when aiodns is installed
+                connector = aiohttp.TCPConnector(
+                    limit=self.config.max_concurrent * 2,
+                    limit_per_host=self.config.max_concurrent,
+                    ttl_dns_cache=300,
+                    use_dns_cache=True,
+                    resolver=aiohttp.AsyncResolver() if AIODNS_AVAILABLE else None,
+                )
                 async with aiohttp.ClientSession(connector=connector) as session:
                     workers = [
                         asyncio.create_task(self._worker(session))
@@ -374,11 +568,22 @@ class WebCrawler:
 
                     await self._queue.join()
 
-                    for worker in workers:
-                        worker.cancel()
-                    await asyncio.gather(*workers, return_exceptions=True)
+                    # All pages processed; retire the workers
+                    for _ in workers:
+                        self._queue.put_nowait(None)
+                    await asyncio.gather(*workers)
 
         finally:
+            if self._cpu_pool:
+                self._cpu_pool.shutdown()
+                self._cpu_pool = None
+
+            # Persist validators for the next crawl
+            self._save_etag_cache()
+
+            # Release the storage I/O context (no-op without caio)
+            self.storage.close()
+
             # Stop browser if started
             if self._browser:
                 await self._browser.stop()
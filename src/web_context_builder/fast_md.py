@@ -0,0 +1,68 @@
+"""Optional numba-accelerated whitespace normalization for markdown.
+
+The post-processing in parser.clean_markdown is pure byte-level work:
+strip trailing whitespace, collapse space runs, cap blank-line runs.
+When numba is installed (via the [perf] extra) that scan runs as JIT
+compiled native code over the encoded buffer; parser.py falls back to
+its pure-Python line pass otherwise.
+"""
+
+# numba (and its numpy dependency) is an optional dependency
+try:
+    import numba
+    import numpy as np
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @numba.njit(cache=True)
+    def _normalize_ws(buf):  # pragma: no cover - compiled
+        """Single-pass whitespace state machine over a uint8 buffer.
+
+        Mirrors the pure-Python fallback byte for byte: runs of two or
+        more spaces collapse to one, tabs pass through untouched,
+        trailing whitespace is dropped at end of line, and newline runs
+        are capped at two, i.e. at most one blank line.
+        """
+        n = buf.shape[0]
+        out = np.empty(n, dtype=np.uint8)
+        j = 0
+        content_j = 0  # output length up to the last non-whitespace byte
+        newline_run = 0
+        for i in range(n):
+            c = buf[i]
+            if c == 10:
+                # Line ended: rewind over trailing spaces/tabs
+                j = content_j
+                newline_run += 1
+                if newline_run <= 2:
+                    out[j] = 10
+                    j += 1
+                content_j = j
+            elif c == 32:
+                # Collapse runs of two or more spaces to one
+                if j == 0 or out[j - 1] != 32:
+                    out[j] = 32
+                    j += 1
+            elif c == 9:
+                # Tabs are ordinary bytes to the fallback's space regex
+                out[j] = 9
+                j += 1
+            else:
+                out[j] = c
+                j += 1
+                newline_run = 0
+                content_j = j
+        return out[:j]
+
+
+def clean_text(text: str) -> str:
+    """Normalize markdown whitespace via the JIT'd byte scanner.
+
+    Callers must check NUMBA_AVAILABLE first.
+    """
+    buf = np.frombuffer(text.encode("utf-8"), dtype=np.uint8)
+    return bytes(_normalize_ws(buf)).decode("utf-8").strip()
@@ -2,11 +2,20 @@
 
 import re
 from typing import Optional
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlparse, urlsplit
 
 from bs4 import BeautifulSoup, Comment, NavigableString, Tag
 from markdownify import MarkdownConverter
 
+from . import fast_md
+
+# selectolax (lexbor) is an optional dependency used as a fast conversion path
+try:
+    from selectolax.lexbor import LexborHTMLParser, LexborNode
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
 
 class LLMOptimizedConverter(MarkdownConverter):
     """Custom markdown converter optimized for LLM consumption."""
@@ -15,11 +24,28 @@ class LLMOptimizedConverter(MarkdownConverter):
         self.base_url = base_url
         super().__init__(**kwargs)
 
+    @property
+    def base_url(self) -> str:
+        return self._base_url
+
+    @base_url.setter
+    def base_url(self, value: str) -> None:
+        # Pre-split the base so root-relative links resolve with a plain
+        # string concat instead of urljoin reparsing the base every call
+        self._base_url = value
+        split = urlsplit(value)
+        self._origin = f"{split.scheme}://{split.netloc}" if split.netloc else ""
+
+    def _resolve(self, href: str) -> str:
+        if self._origin and href.startswith("/") and not href.startswith("//"):
+            return self._origin + href
+        return urljoin(self._base_url, href)
+
     def convert_a(self, el: Tag, text: str, convert_as_inline: bool = False, **kwargs) -> str:
         """Convert links, resolving relative URLs."""
         href = el.get("href", "")
         if href and not href.startswith(("http://", "https://", "mailto:", "#")):
-            href = urljoin(self.base_url, href)
+            href = self._resolve(href)
 
         title = el.get("title", "")
         text = text.strip()
@@ -35,7 +61,7 @@ class LLMOptimizedConverter(MarkdownConverter):
         """Convert images to markdown, resolving relative URLs."""
         src = el.get("src", "")
         if src and not src.startswith(("http://", "https://", "data:")):
-            src = urljoin(self.base_url, src)
+            src = self._resolve(src)
 
         alt = el.get("alt", "")
         title = el.get("title", "")
@@ -48,6 +74,23 @@ class LLMOptimizedConverter(MarkdownConverter):
         return f"![{alt}]({src})"
 
 
+def _code_language(el: Tag) -> str:
+    """Read the language from a code block's language- class."""
+    classes = el.get("class")
+    return classes[0].replace("language-", "") if classes else ""
+
+
+# Built once and reused for every page: constructing a MarkdownConverter
+# rebuilds its options/method tables. Re-pointing base_url between calls is
+# safe because the crawler runs in a single-threaded event loop.
+_CONVERTER = LLMOptimizedConverter(
+    base_url="",
+    heading_style="atx",
+    bullets="-",
+    code_language_callback=_code_language,
+)
+
+
 # Elements to completely remove (navigation, ads, etc.)
 REMOVE_SELECTORS = [
     "nav",
@@ -94,6 +137,12 @@ REMOVE_SELECTORS = [
     "textarea",
 ]
 
+# Grouped selector so the tree is walked once instead of once per selector
+COMBINED_REMOVE_SELECTOR = ", ".join(REMOVE_SELECTORS)
+
+# Self-closing elements kept even when they have no children
+_KEEP_EMPTY = frozenset({"br", "hr", "img"})
+
 
 def clean_html(soup: BeautifulSoup) -> BeautifulSoup:
     """Remove non-content elements from HTML."""
@@ -102,18 +151,21 @@ def clean_html(soup: BeautifulSoup) -> BeautifulSoup:
         comment.extract()
 
     # Remove unwanted elements
-    for selector in REMOVE_SELECTORS:
-        for element in soup.select(selector):
+    for element in soup.select(COMBINED_REMOVE_SELECTOR):
+        element.decompose()
+
+    # Remove empty elements bottom-up: children are decomposed before their
+    # parents are inspected, so each element is checked against its direct
+    # contents instead of materializing the whole subtree's text
+    for element in reversed(soup.find_all(True)):
+        if element.name in _KEEP_EMPTY:
+            continue
+        if all(
+            isinstance(child, NavigableString) and not child.strip()
+            for child in element.contents
+        ):
             element.decompose()
 
-    # Remove empty elements
-    for element in soup.find_all():
-        if isinstance(element, Tag):
-            # Keep elements that have content or are self-closing
-            if element.name not in ["br", "hr", "img"]:
-                if not element.get_text(strip=True) and not element.find("img"):
-                    element.decompose()
-
     return soup
 
 
@@ -132,28 +184,22 @@ def extract_title(soup: BeautifulSoup) -> str:
     return "Untitled"
 
 
+# Priority tiers for main content. Each tier is one compound query (a
+# single tree walk instead of one walk per selector); document order
+# decides within a tier, tier order decides across tiers.
+MAIN_CONTENT_SELECTOR_TIERS = (
+    # Semantic containers
+    "main, article, [role='main']",
+    # Common content class/id conventions (.markdown-body is GitHub-style)
+    ".main-content, .content, .post-content, .article-content, .entry-content, "
+    "#main, #content, #main-content, .markdown-body, .documentation, .docs-content",
+)
+
+
 def extract_main_content(soup: BeautifulSoup) -> Optional[Tag]:
     """Extract the main content area of the page."""
-    # Priority order for main content
-    selectors = [
-        "main",
-        "article",
-        "[role='main']",
-        ".main-content",
-        ".content",
-        ".post-content",
-        ".article-content",
-        ".entry-content",
-        "#main",
-        "#content",
-        "#main-content",
-        ".markdown-body",  # GitHub-style
-        ".documentation",
-        ".docs-content",
-    ]
-
-    for selector in selectors:
-        content = soup.select_one(selector)
+    for tier in MAIN_CONTENT_SELECTOR_TIERS:
+        content = soup.select_one(tier)
         if content:
             return content
 
@@ -171,6 +217,10 @@ def html_to_markdown(html: str, url: str) -> str:
     Returns:
         Clean markdown optimized for LLM consumption
     """
+    # Fast path: C-level parsing + single-pass markdown emission via lexbor
+    if SELECTOLAX_AVAILABLE:
+        return _html_to_markdown_lexbor(html, url)
+
     soup = BeautifulSoup(html, "lxml")
 
     # Extract title before cleaning
@@ -186,14 +236,8 @@ def html_to_markdown(html: str, url: str) -> str:
         return f"# {title}\n\n*No content extracted*"
 
     # Convert to markdown
-    converter = LLMOptimizedConverter(
-        base_url=url,
-        heading_style="atx",
-        bullets="-",
-        code_language_callback=lambda el: el.get("class", [""])[0].replace("language-", "") if el.get("class") else "",
-    )
-
-    markdown = converter.convert(str(main_content))
+    _CONVERTER.base_url = url
+    markdown = _CONVERTER.convert(str(main_content))
 
     # Post-process markdown
     markdown = clean_markdown(markdown)
@@ -205,25 +249,329 @@ def html_to_markdown(html: str, url: str) -> str:
     return markdown
 
 
+# Compiled once; applied per line in clean_markdown's single pass
+_EMPTY_LINK_RE = re.compile(r"\[([^\]]*)\]\(\s*\)")
+_MULTISPACE_RE = re.compile(r"  +")
+
+# Used on the numba fast path, where only the regex-shaped transforms stay
+# in Python and the whitespace scan runs as native code. The empty-link
+# variant excludes newlines so the whole-document application matches
+# exactly what the fallback's per-line application would
+_EMPTY_LINK_DOC_RE = re.compile(r"\[([^\]\n]*)\]\([ \t]*\)")
+_LONE_DASH_RE = re.compile(r"^\s*-\s*$", re.MULTILINE)
+_HEADER_SPACING_RE = re.compile(r"\n#")
+
+
 def clean_markdown(markdown: str) -> str:
-    """Clean up the generated markdown."""
-    # Remove excessive newlines (more than 2)
-    markdown = re.sub(r"\n{3,}", "\n\n", markdown)
+    """Clean up the generated markdown.
 
-    # Remove trailing whitespace from lines
-    lines = [line.rstrip() for line in markdown.split("\n")]
-    markdown = "\n".join(lines)
+    Normalizes the document in a single pass over its lines instead of
+    running several whole-document regex substitutions: trailing whitespace
+    is stripped, empty links are unwrapped, stray empty list items are
+    dropped, space runs are collapsed, consecutive blank lines are capped
+    at one, and headers get a blank line before them.
 
-    # Remove empty links
-    markdown = re.sub(r"\[([^\]]*)\]\(\s*\)", r"\1", markdown)
+    With numba installed, the whitespace normalization runs as JIT
+    compiled native code over the encoded bytes (see fast_md).
+    """
+    if fast_md.NUMBA_AVAILABLE:
+        markdown = _EMPTY_LINK_DOC_RE.sub(r"\1", markdown)
+        markdown = _LONE_DASH_RE.sub("", markdown)
+        markdown = _HEADER_SPACING_RE.sub("\n\n#", markdown)
+        return fast_md.clean_text(markdown)
+
+    cleaned: list[str] = []
+    blank_run = 0
+
+    for line in markdown.splitlines():
+        # Unwrap empty links before stripping, so whitespace they leave
+        # dangling at end of line is dropped too
+        line = _EMPTY_LINK_RE.sub(r"\1", line).rstrip()
+        if line.strip() == "-":
+            line = ""
+        else:
+            line = _MULTISPACE_RE.sub(" ", line)
+
+        if not line:
+            blank_run += 1
+            if blank_run > 1:
+                continue
+        else:
+            if line.startswith("#") and cleaned and cleaned[-1]:
+                cleaned.append("")
+            blank_run = 0
+        cleaned.append(line)
+
+    return "\n".join(cleaned).strip()
+
+
+# -- selectolax (lexbor) fast path ------------------------------------------
+
+_HEADING_PREFIXES = {f"h{i}": "#" * i for i in range(1, 7)}
+_INLINE_MARKS = {"strong": "**", "b": "**", "em": "*", "i": "*"}
+_BLOCK_TAGS = frozenset(
+    list(_HEADING_PREFIXES)
+    + [
+        "p", "ul", "ol", "li", "pre", "blockquote", "hr", "table",
+        "div", "section", "article", "main", "figure", "details",
+        "dl", "dt", "dd",
+    ]
+)
 
-    # Clean up list formatting
-    markdown = re.sub(r"^\s*-\s*$", "", markdown, flags=re.MULTILINE)
 
-    # Remove excessive spaces
-    markdown = re.sub(r"  +", " ", markdown)
+class _LexborMarkdownRenderer:
+    """Single-pass markdown emitter for a lexbor tree.
 
-    # Ensure proper spacing around headers
-    markdown = re.sub(r"(\n#)", r"\n\1", markdown)
+    Replaces the markdownify traversal on the fast path: each node is
+    visited once and markdown fragments are collected into a list that is
+    joined at the end.
+    """
 
-    return markdown.strip()
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+
+    def render(self, node: "LexborNode") -> str:
+        blocks: list[str] = []
+        self._render_blocks(node, blocks)
+        return "\n\n".join(block for block in blocks if block)
+
+    def _resolve(self, href: str) -> str:
+        if href and not href.startswith(("http://", "https://", "mailto:", "#", "data:")):
+            href = urljoin(self.base_url, href)
+        return href
+
+    def _render_inline(self, node: "LexborNode") -> str:
+        parts: list[str] = []
+        child = node.child
+        while child is not None:
+            tag = child.tag
+            if tag == "-text":
+                parts.append(child.text_content or "")
+            elif tag == "br":
+                parts.append("\n")
+            elif tag in _INLINE_MARKS:
+                inner = self._render_inline(child).strip()
+                if inner:
+                    mark = _INLINE_MARKS[tag]
+                    parts.append(f"{mark}{inner}{mark}")
+            elif tag == "code":
+                inner = child.text(deep=True).strip()
+                if inner:
+                    parts.append(f"`{inner}`")
+            elif tag == "a":
+                parts.append(self._render_link(child))
+            elif tag == "img":
+                parts.append(self._render_image(child))
+            else:
+                parts.append(self._render_inline(child))
+            child = child.next
+        return "".join(parts)
+
+    def _render_link(self, node: "LexborNode") -> str:
+        attrs = node.attributes or {}
+        href = attrs.get("href") or ""
+        text = self._render_inline(node).strip()
+        if not text or not href:
+            return text
+        href = self._resolve(href)
+        title = attrs.get("title") or ""
+        if title:
+            return f'[{text}]({href} "{title}")'
+        return f"[{text}]({href})"
+
+    def _render_image(self, node: "LexborNode") -> str:
+        attrs = node.attributes or {}
+        src = attrs.get("src") or ""
+        if not src:
+            return ""
+        src = self._resolve(src)
+        alt = attrs.get("alt") or ""
+        title = attrs.get("title") or ""
+        if title:
+            return f'![{alt}]({src} "{title}")'
+        return f"![{alt}]({src})"
+
+    def _render_blocks(self, node: "LexborNode", blocks: list[str]) -> None:
+        """Render a container's children, flushing inline runs as paragraphs."""
+        inline_run: list[str] = []
+        child = node.child
+        while child is not None:
+            tag = child.tag
+            if tag in _BLOCK_TAGS:
+                self._flush_inline(inline_run, blocks)
+                self._render_block(child, blocks)
+            elif tag == "-text":
+                inline_run.append(child.text_content or "")
+            else:
+                inline_run.append(self._render_inline_single(child))
+            child = child.next
+        self._flush_inline(inline_run, blocks)
+
+    def _render_inline_single(self, node: "LexborNode") -> str:
+        tag = node.tag
+        if tag == "br":
+            return "\n"
+        if tag in _INLINE_MARKS:
+            inner = self._render_inline(node).strip()
+            mark = _INLINE_MARKS[tag]
+            return f"{mark}{inner}{mark}" if inner else ""
+        if tag == "code":
+            inner = node.text(deep=True).strip()
+            return f"`{inner}`" if inner else ""
+        if tag == "a":
+            return self._render_link(node)
+        if tag == "img":
+            return self._render_image(node)
+        return self._render_inline(node)
+
+    def _flush_inline(self, inline_run: list[str], blocks: list[str]) -> None:
+        if inline_run:
+            text = "".join(inline_run).strip()
+            if text:
+                blocks.append(text)
+            inline_run.clear()
+
+    def _render_block(self, node: "LexborNode", blocks: list[str]) -> None:
+        tag = node.tag
+        if tag in _HEADING_PREFIXES:
+            text = self._render_inline(node).strip()
+            if text:
+                blocks.append(f"{_HEADING_PREFIXES[tag]} {text}")
+        elif tag == "p":
+            text = self._render_inline(node).strip()
+            if text:
+                blocks.append(text)
+        elif tag == "pre":
+            blocks.append(self._render_code_block(node))
+        elif tag in ("ul", "ol"):
+            lines: list[str] = []
+            self._render_list(node, lines, indent="", ordered=(tag == "ol"))
+            if lines:
+                blocks.append("\n".join(lines))
+        elif tag == "blockquote":
+            inner: list[str] = []
+            self._render_blocks(node, inner)
+            quoted = "\n\n".join(inner)
+            if quoted:
+                blocks.append("\n".join(f"> {line}" for line in quoted.split("\n")))
+        elif tag == "hr":
+            blocks.append("---")
+        elif tag == "table":
+            self._render_table(node, blocks)
+        else:
+            # Generic container (div, section, etc.)
+            self._render_blocks(node, blocks)
+
+    def _render_code_block(self, node: "LexborNode") -> str:
+        code_el = node.css_first("code")
+        language = ""
+        if code_el is not None:
+            classes = (code_el.attributes or {}).get("class") or ""
+            for cls in classes.split():
+                if cls.startswith("language-"):
+                    language = cls[len("language-"):]
+                    break
+        code = node.text(deep=True).rstrip("\n")
+        return f"```{language}\n{code}\n```"
+
+    def _render_list(
+        self, node: "LexborNode", lines: list[str], indent: str, ordered: bool
+    ) -> None:
+        index = 1
+        child = node.child
+        while child is not None:
+            if child.tag == "li":
+                marker = f"{index}. " if ordered else "- "
+                item_blocks: list[str] = []
+                inline_run: list[str] = []
+                grandchild = child.child
+                nested: list[tuple["LexborNode", bool]] = []
+                while grandchild is not None:
+                    if grandchild.tag in ("ul", "ol"):
+                        nested.append((grandchild, grandchild.tag == "ol"))
+                    elif grandchild.tag == "-text":
+                        inline_run.append(grandchild.text_content or "")
+                    elif grandchild.tag in _BLOCK_TAGS:
+                        self._flush_inline(inline_run, item_blocks)
+                        self._render_block(grandchild, item_blocks)
+                    else:
+                        inline_run.append(self._render_inline_single(grandchild))
+                    grandchild = grandchild.next
+                self._flush_inline(inline_run, item_blocks)
+                text = " ".join(item_blocks).strip() or ""
+                lines.append(f"{indent}{marker}{text}".rstrip())
+                for nested_list, nested_ordered in nested:
+                    self._render_list(nested_list, lines, indent + "  ", nested_ordered)
+                index += 1
+            child = child.next
+
+    def _render_table(self, node: "LexborNode", blocks: list[str]) -> None:
+        rows = node.css("tr")
+        if not rows:
+            return
+        lines: list[str] = []
+        for i, row in enumerate(rows):
+            cells = [
+                self._render_inline(cell).strip().replace("|", "\\|")
+                for cell in row.css("th, td")
+            ]
+            if not cells:
+                continue
+            lines.append("| " + " | ".join(cells) + " |")
+            if i == 0:
+                lines.append("|" + "|".join(" --- " for _ in cells) + "|")
+        if lines:
+            blocks.append("\n".join(lines))
+
+
+_LEXBOR_STRIP_TAGS = [
+    "script", "style", "noscript", "iframe",
+    "form", "button", "input", "select", "textarea",
+]
+
+# Class/id/role-based removals still go through CSS selection
+_LEXBOR_REMOVE_SELECTOR = ", ".join(
+    selector for selector in REMOVE_SELECTORS if selector not in _LEXBOR_STRIP_TAGS
+)
+
+
+def _html_to_markdown_lexbor(html: str, url: str) -> str:
+    """Fast html_to_markdown path using selectolax's lexbor backend."""
+    tree = LexborHTMLParser(html)
+
+    # Extract title before cleaning
+    h1 = tree.css_first("h1")
+    if h1 is not None:
+        title = h1.text(deep=True).strip()
+    else:
+        title_el = tree.css_first("title")
+        title = title_el.text(deep=True).strip() if title_el is not None else "Untitled"
+    title = title or "Untitled"
+
+    # Clean the tree
+    tree.strip_tags(_LEXBOR_STRIP_TAGS)
+    for element in tree.css(_LEXBOR_REMOVE_SELECTOR):
+        element.decompose()
+
+    # Extract main content (same priority tiers as the BeautifulSoup path)
+    main_content = None
+    for tier in MAIN_CONTENT_SELECTOR_TIERS:
+        main_content = tree.css_first(tier)
+        if main_content is not None:
+            break
+    if main_content is None:
+        main_content = tree.body
+
+    if main_content is None:
+        return f"# {title}\n\n*No content extracted*"
+
+    markdown = _LexborMarkdownRenderer(base_url=url).render(main_content)
+
+    # Post-process markdown
+    markdown = clean_markdown(markdown)
+
+    # Add title if not already present
+    if not markdown.strip().startswith("#"):
+        markdown = f"# {title}\n\n{markdown}"
+
+    return markdown
@@ -2,17 +2,92 @@
 
 import asyncio
 import hashlib
+import os
 import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 from urllib.parse import urlparse
 
-import aiofiles
+# caio is an optional dependency (from the [perf] extra); it submits
+# writes through io_uring/Linux AIO instead of the threadpool
+try:
+    from caio import AsyncioContext
 
+    CAIO_AVAILABLE = True
+except ImportError:
+    CAIO_AVAILABLE = False
 
+# Compiled once at import; saves the re-cache lookup on every call
+_UNSAFE_FILENAME_RE = re.compile(r"[^\w\-_.]")
+_UNSAFE_ANCHOR_RE = re.compile(r"[^\w\-]")
+
+
+@lru_cache(maxsize=8192)
+def _safe_anchor(url: str) -> str:
+    """Anchor-safe form of a URL; each unique URL is converted once."""
+    return _UNSAFE_ANCHOR_RE.sub("-", url)
+
+
+def _sync_write(path: Path, header: bytes, body: bytes) -> None:
+    """Open, write, and close in one thread hop (see save_page).
+
+    Header and body are written back to back so they never have to be
+    concatenated into one buffer.
+    """
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(body)
+
+
+def _bulk_write(entries: list[tuple[Path, bytes, bytes]]) -> None:
+    """Write many files in one thread excursion (see save_pages)."""
+    for path, header, body in entries:
+        with open(path, "wb") as f:
+            f.write(header)
+            f.write(body)
+
+
+def _sync_merge_write(
+    path: Path, files: list[tuple[str, Path, str]], separator: str
+) -> None:
+    """Stream the merged document to disk with buffered sync writes."""
+    # Resolve each page's anchor once up front; the TOC and body passes
+    # below share the enriched tuples
+    enriched = [(url, _safe_anchor(url), markdown) for url, _, markdown in files]
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("# Merged Documentation\n")
+        f.write(f"**Total Pages:** {len(enriched)}\n")
+        f.write("\n## Table of Contents\n")
+
+        # Build the table of contents in one join and one write rather
+        # than a buffered write per entry
+        toc_lines = [
+            f"{i}. [{url}](#{anchor})" for i, (url, anchor, _) in enumerate(enriched, 1)
+        ]
+        if toc_lines:
+            f.write("\n".join(toc_lines) + "\n")
+
+        f.write(separator)
+
+        # Add each page (markdown is already in memory from save_page)
+        for url, anchor, markdown in enriched:
+            # Add anchor for TOC linking
+            f.write(f'<a id="{anchor}"></a>\n\n')
+            f.write(f"## Source: {url}\n\n")
+            f.write(f"<!-- Source: {url} -->\n\n")
+            f.write(markdown)
+            f.write(separator)
+
+
+@lru_cache(maxsize=4096)
 def url_to_filename(url: str) -> str:
     """Convert a URL to a safe filename.
 
+    Memoized since the same URL is filenamed repeatedly (save, merge,
+    anchors).
+
     Args:
         url: The URL to convert
 
@@ -26,10 +101,11 @@ def url_to_filename(url: str) -> str:
     filename = path.replace("/", "_")
 
     # Remove or replace unsafe characters
-    filename = re.sub(r"[^\w\-_.]", "_", filename)
+    filename = _UNSAFE_FILENAME_RE.sub("_", filename)
 
-    # Add hash suffix for uniqueness (handles query params, etc.)
-    url_hash = hashlib.md5(url.encode()).hexdigest()[:8]
+    # Add hash suffix for uniqueness (handles query params, etc.);
+    # blake2b computes just the 4 bytes we need and is faster than md5
+    url_hash = hashlib.blake2b(url.encode("utf-8"), digest_size=4).hexdigest()
 
     # Truncate if too long
     if len(filename) > 200:
@@ -44,9 +120,16 @@ class StorageManager:
     def __init__(self, output_dir: Path, merged_filename: str = "merged_content.md"):
         self.output_dir = output_dir
         self.pages_dir = output_dir / "pages"
+        # Precomputed prefix so per-save paths are built by string
+        # concatenation instead of Path.__truediv__
+        self._pages_dir_str = str(self.pages_dir) + os.sep
         self.merged_path = output_dir / merged_filename
         self._lock = asyncio.Lock()
-        self._saved_files: list[tuple[str, Path]] = []  # (url, path) pairs
+        # (url, path, markdown) triples; the markdown is kept in memory
+        # so merge_all never has to read the files back from disk
+        self._saved_files: list[tuple[str, Path, str]] = []
+        # Lazily created inside the running loop when caio is installed
+        self._aio_context = None
 
     async def initialize(self) -> None:
         """Create output directories."""
@@ -63,19 +146,106 @@ class StorageManager:
         Returns:
             Path to the saved file
         """
-        filename = url_to_filename(url)
-        filepath = self.pages_dir / filename
+        # One Path construction from the cached directory prefix
+        filepath = Path(self._pages_dir_str + url_to_filename(url))
+
+        # Encode the source-URL header and body separately; each is
+        # encoded exactly once and never joined into a throwaway string
+        header = f"<!-- Source: {url} -->\n\n".encode("utf-8")
+        body = markdown.encode("utf-8")
+
+        if CAIO_AVAILABLE:
+            # Completion-based I/O: the write is submitted to the kernel
+            # (io_uring where available) with no threadpool involvement
+            await self._aio_write(filepath, header, body)
+        else:
+            # One to_thread hop for open+write+close beats aiofiles'
+            # per-op thread dispatch
+            await asyncio.to_thread(_sync_write, filepath, header, body)
+
+        async with self._lock:
+            self._saved_files.append((url, filepath, markdown))
+
+        return filepath
 
-        # Add source URL header
-        content = f"<!-- Source: {url} -->\n\n{markdown}"
+    async def save_pages(self, items: list[tuple[str, str]]) -> list[Path]:
+        """Save many pages in a single thread excursion.
 
-        async with aiofiles.open(filepath, "w", encoding="utf-8") as f:
-            await f.write(content)
+        Amortizes the event-loop-to-thread dispatch that save_page pays
+        per file; useful when a batch of results is available at once.
+
+        Args:
+            items: (url, markdown) pairs
+
+        Returns:
+            Paths to the saved files, in input order
+        """
+        records = []
+        entries = []
+        for url, markdown in items:
+            filepath = Path(self._pages_dir_str + url_to_filename(url))
+            records.append((url, filepath, markdown))
+            entries.append(
+                (filepath, f"<!-- Source: {url} -->\n\n".encode("utf-8"), markdown.encode("utf-8"))
+            )
+
+        await asyncio.to_thread(_bulk_write, entries)
 
         async with self._lock:
-            self._saved_files.append((url, filepath))
+            self._saved_files.extend(records)
 
-        return filepath
+        return [path for _, path, _ in records]
+
+    def has_saved_page(self, url: str) -> bool:
+        """Check whether a previous run's page file exists on disk."""
+        return Path(self._pages_dir_str + url_to_filename(url)).exists()
+
+    async def restore_page(self, url: str) -> Optional[str]:
+        """Re-register a page file saved by a previous run.
+
+        Used on 304 revalidations: the ledger starts empty each run, so
+        the unchanged page is read back from disk to keep it in the
+        merged output and the saved count.
+
+        Args:
+            url: Source URL
+
+        Returns:
+            The page's markdown, or None if the file is gone
+        """
+        filepath = Path(self._pages_dir_str + url_to_filename(url))
+        try:
+            content = await asyncio.to_thread(filepath.read_text, encoding="utf-8")
+        except OSError:
+            return None
+
+        # Drop the source-URL header written by save_page
+        _, sep, markdown = content.partition("-->\n\n")
+        if not sep:
+            markdown = content
+
+        async with self._lock:
+            self._saved_files.append((url, filepath, markdown))
+
+        return markdown
+
+    async def _aio_write(self, path: Path, header: bytes, body: bytes) -> None:
+        """Write a file through the caio completion context."""
+        if self._aio_context is None:
+            self._aio_context = AsyncioContext(max_requests=256)
+
+        fd = os.open(path, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o644)
+        try:
+            await self._aio_context.write(header, fd, 0)
+            await self._aio_context.write(body, fd, len(header))
+        finally:
+            os.close(fd)
+
+    def close(self) -> None:
+        """Release the caio context, if one was created."""
+        if self._aio_context is not None:
+            self._aio_context.close()
+            self._aio_context = None
 
     async def merge_all(self, separator: str = "\n\n---\n\n") -> Path:
         """Merge all saved pages into a single file.
@@ -92,32 +262,9 @@ class StorageManager:
         # Sort by URL for consistent ordering
         files.sort(key=lambda x: x[0])
 
-        merged_content = []
-        merged_content.append("# Merged Documentation\n")
-        merged_content.append(f"**Total Pages:** {len(files)}\n")
-        merged_content.append("\n## Table of Contents\n")
-
-        # Build table of contents
-        for i, (url, _) in enumerate(files, 1):
-            safe_anchor = re.sub(r"[^\w\-]", "-", url)
-            merged_content.append(f"{i}. [{url}](#{safe_anchor})\n")
-
-        merged_content.append(separator)
-
-        # Add each page
-        for url, filepath in files:
-            async with aiofiles.open(filepath, "r", encoding="utf-8") as f:
-                content = await f.read()
-
-            # Add anchor for TOC linking
-            safe_anchor = re.sub(r"[^\w\-]", "-", url)
-            merged_content.append(f'<a id="{safe_anchor}"></a>\n\n')
-            merged_content.append(f"## Source: {url}\n\n")
-            merged_content.append(content)
-            merged_content.append(separator)
-
-        async with aiofiles.open(self.merged_path, "w", encoding="utf-8") as f:
-            await f.write("".join(merged_content))
+        # Stream the whole document in a single thread excursion; buffered
+        # sync writes keep peak memory at roughly one page
+        await asyncio.to_thread(_sync_merge_write, self.merged_path, files, separator)
 
         return self.merged_path
 
@@ -128,4 +275,4 @@ class StorageManager:
 
     def get_saved_files(self) -> list[tuple[str, Path]]:
         """Return list of saved files."""
-        return list(self._saved_files)
+        return [(url, path) for url, path, _ in self._saved_files]
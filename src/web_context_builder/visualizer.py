@@ -1,8 +1,10 @@
 """Rich CLI visualization for the web crawler."""
 
-import asyncio
+from array import array
+from collections import deque
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import IntEnum
+from functools import lru_cache
 from typing import Optional
 from urllib.parse import urlparse
 
@@ -22,14 +24,64 @@ from rich.text import Text
 from rich.tree import Tree
 
 
-class PageStatus(Enum):
-    """Status of a page being crawled."""
+@lru_cache(maxsize=8192)
+def _parsed(url: str):
+    """Cached urlparse; display code re-parses the same URLs on every refresh."""
+    return urlparse(url)
 
-    PENDING = "pending"
-    CRAWLING = "crawling"
-    SUCCESS = "success"
-    FAILED = "failed"
-    SKIPPED = "skipped"
+
+@lru_cache(maxsize=4096)
+def _truncate_url(url: str, max_len: int = 40) -> str:
+    """Truncate URL for display.
+
+    Module-level so lru_cache never holds the visualizer alive; URLs
+    short enough to display whole skip urlparse entirely.
+    """
+    if len(url) <= max_len and "//" not in url[8:]:
+        return url
+
+    path = _parsed(url).path or "/"
+
+    if len(path) > max_len:
+        return f"...{path[-(max_len-3):]}"
+    return path
+
+
+class PageStatus(IntEnum):
+    """Status of a page being crawled.
+
+    Integer-valued so status-keyed lookups are plain tuple indexing.
+    """
+
+    PENDING = 0
+    CRAWLING = 1
+    SUCCESS = 2
+    FAILED = 3
+    SKIPPED = 4
+
+
+# Indexed by PageStatus value; avoids a dict hash per rendered cell
+_STATUS_ICONS = (
+    "[yellow]○[/yellow]",
+    "[cyan]◉[/cyan]",
+    "[green]✓[/green]",
+    "[red]✗[/red]",
+    "[dim]○[/dim]",
+)
+_STATUS_TEXTS = (
+    "[yellow]Pending[/yellow]",
+    "[cyan]Crawling[/cyan]",
+    "[green]Done[/green]",
+    "[red]Failed[/red]",
+    "[dim]Skipped[/dim]",
+)
+
+# Terminal statuses mapped to the CrawlStats counter they bump
+_STAT_ATTR = {
+    PageStatus.SUCCESS: "pages_crawled",
+    PageStatus.FAILED: "pages_failed",
+    PageStatus.SKIPPED: "pages_skipped",
+}
 
 
 @dataclass
@@ -43,6 +95,11 @@ class PageInfo:
     links_found: int = 0
     error: Optional[str] = None
     parent_url: Optional[str] = None
+    # Truncated form for the crawl tree, computed once at add_page
+    cached_truncated: str = ""
+    # Tree label (status icon + truncated URL/title), refreshed only
+    # when status or title changes
+    display_label: str = ""
 
 
 @dataclass
@@ -71,8 +128,10 @@ class CrawlerVisualizer:
         self.max_depth = max_depth
         self.stats = CrawlStats()
         self.pages: dict[str, PageInfo] = {}
-        self._lock = asyncio.Lock()
         self._live: Optional[Live] = None
+        # Redirected output (files, CI) gets occasional plain progress
+        # lines instead of a live panel repainted at 4 Hz
+        self._tty = self.console.is_terminal
 
         # Progress tracking
         self._progress = Progress(
@@ -85,16 +144,37 @@ class CrawlerVisualizer:
         )
         self._main_task: Optional[TaskID] = None
 
-        # URL tree for visualization
-        self._url_tree: dict[str, list[str]] = {}  # parent -> children
+        # URL tree for visualization. URLs are interned to small integer
+        # ids; edges are unsigned-int arrays instead of lists of strings,
+        # so the tree costs one string per URL no matter how many edges
+        # reference it
+        self._url_to_id: dict[str, int] = {}
+        self._urls: list[str] = []
+        self._children: list[array] = []  # id -> ids of children
+
+        # Most recently updated pages, newest first; bounded so the
+        # activity table never has to sort the full page dict
+        self._recent: deque[PageInfo] = deque(maxlen=16)
+
+        # Rebuilt crawl tree is reused across frames until the structure
+        # or a label actually changes
+        self._tree_dirty = True
+        self._cached_tree: Optional[Tree] = None
 
     async def start(self) -> None:
         """Start the live display."""
+        if not self._tty:
+            self.console.print(f"Crawling {self.root_url} ...")
+            return
+
         self._main_task = self._progress.add_task(
             "[cyan]Crawling pages...", total=None
         )
+        # Pass the visualizer itself as the renderable; Rich pulls the
+        # current display via __rich__ only when it actually repaints
+        # (4 Hz), so per-event rebuilds are never wasted on dropped frames
         self._live = Live(
-            self._generate_display(),
+            self,
             console=self.console,
             refresh_per_second=4,
             transient=False,
@@ -106,28 +186,34 @@ class CrawlerVisualizer:
         if self._live:
             self._live.stop()
 
-    async def add_page(self, url: str, depth: int, parent_url: Optional[str] = None) -> None:
-        """Register a new page to be crawled."""
-        async with self._lock:
-            if url not in self.pages:
-                self.pages[url] = PageInfo(
-                    url=url, depth=depth, parent_url=parent_url
-                )
-                self.stats.pages_discovered += 1
-                self.stats.max_depth_reached = max(self.stats.max_depth_reached, depth)
-
-                # Track tree structure
-                if parent_url:
-                    if parent_url not in self._url_tree:
-                        self._url_tree[parent_url] = []
-                    self._url_tree[parent_url].append(url)
-                else:
-                    self._url_tree[url] = []
-
-                self._update_progress()
-                self._refresh_display()
-
-    async def update_page(
+    def add_page(self, url: str, depth: int, parent_url: Optional[str] = None) -> None:
+        """Register a new page to be crawled.
+
+        Plain method: state lives in one event loop and nothing here
+        awaits, so no lock is needed.
+        """
+        if url not in self.pages:
+            truncated = _truncate_url(url, 50)
+            self.pages[url] = PageInfo(
+                url=url,
+                depth=depth,
+                parent_url=parent_url,
+                cached_truncated=truncated,
+                display_label=f"{self._get_status_icon(PageStatus.PENDING)} {truncated}",
+            )
+            self.stats.pages_discovered += 1
+            self.stats.max_depth_reached = max(self.stats.max_depth_reached, depth)
+
+            # Track tree structure (roots get their empty child array
+            # from interning alone)
+            page_id = self._intern(url)
+            if parent_url:
+                self._children[self._intern(parent_url)].append(page_id)
+
+            self._tree_dirty = True
+            self._update_progress()
+
+    def update_page(
         self,
         url: str,
         status: PageStatus,
@@ -136,24 +222,60 @@ class CrawlerVisualizer:
         error: Optional[str] = None,
     ) -> None:
         """Update the status of a page."""
-        async with self._lock:
-            if url in self.pages:
-                page = self.pages[url]
-                page.status = status
-                page.title = title
-                page.links_found = links_found
-                page.error = error
-
-                if status == PageStatus.SUCCESS:
-                    self.stats.pages_crawled += 1
-                    self.stats.total_links_found += links_found
-                elif status == PageStatus.FAILED:
-                    self.stats.pages_failed += 1
-                elif status == PageStatus.SKIPPED:
-                    self.stats.pages_skipped += 1
-
-                self._update_progress()
-                self._refresh_display()
+        if url in self.pages:
+            page = self.pages[url]
+            page.status = status
+            page.title = title
+            page.links_found = links_found
+            page.error = error
+
+            # A page transitions through several statuses; keep only its
+            # latest entry so the activity table never shows duplicates
+            try:
+                self._recent.remove(page)
+            except ValueError:
+                pass
+            self._recent.appendleft(page)
+
+            status_icon = self._get_status_icon(status)
+            if title and status == PageStatus.SUCCESS:
+                page.display_label = f"{status_icon} {title[:40]}"
+            else:
+                page.display_label = f"{status_icon} {page.cached_truncated}"
+            self._tree_dirty = True
+
+            attr = _STAT_ATTR.get(status)
+            if attr:
+                setattr(self.stats, attr, getattr(self.stats, attr) + 1)
+
+                # Headless progress line, only when this update pushed the
+                # completed count onto the reporting interval
+                if not self._tty:
+                    completed = (
+                        self.stats.pages_crawled
+                        + self.stats.pages_failed
+                        + self.stats.pages_skipped
+                    )
+                    if completed % 25 == 0:
+                        self.console.print(
+                            f"Progress: {completed}/{self.stats.pages_discovered} pages "
+                            f"({self.stats.pages_failed} failed, "
+                            f"{self.stats.pages_skipped} skipped)"
+                        )
+            if status == PageStatus.SUCCESS:
+                self.stats.total_links_found += links_found
+
+            self._update_progress()
+
+    def _intern(self, url: str) -> int:
+        """Return the integer id for a URL, assigning one if new."""
+        page_id = self._url_to_id.get(url)
+        if page_id is None:
+            page_id = len(self._urls)
+            self._url_to_id[url] = page_id
+            self._urls.append(url)
+            self._children.append(array("I"))
+        return page_id
 
     def _update_progress(self) -> None:
         """Update the progress bar."""
@@ -169,10 +291,9 @@ class CrawlerVisualizer:
                 total=self.stats.pages_discovered,
             )
 
-    def _refresh_display(self) -> None:
-        """Refresh the live display."""
-        if self._live:
-            self._live.update(self._generate_display())
+    def __rich__(self) -> Panel:
+        """Render the current state; called by Live on each repaint."""
+        return self._generate_display()
 
     def _generate_display(self) -> Panel:
         """Generate the display panel."""
@@ -189,8 +310,12 @@ class CrawlerVisualizer:
         stats_table.add_row("Max Depth", str(self.stats.max_depth_reached))
         stats_table.add_row("Links Found", str(self.stats.total_links_found))
 
-        # Build URL tree (limited depth for display)
-        tree = self._build_url_tree()
+        # Build URL tree (limited depth for display); reuse the cached
+        # render unless something changed since the last frame
+        if self._tree_dirty or self._cached_tree is None:
+            self._cached_tree = self._build_url_tree()
+            self._tree_dirty = False
+        tree = self._cached_tree
 
         # Recent activity
         recent = self._get_recent_activity()
@@ -209,41 +334,38 @@ class CrawlerVisualizer:
         depth_str = f"/{self.max_depth}" if self.max_depth else ""
         return Panel(
             content,
-            title=f"[bold cyan]Web Context Builder[/bold cyan] - Crawling {self._truncate_url(self.root_url)}",
+            title=f"[bold cyan]Web Context Builder[/bold cyan] - Crawling {_truncate_url(self.root_url)}",
             subtitle=f"Depth: {self.stats.max_depth_reached}{depth_str}",
             border_style="cyan",
         )
 
     def _build_url_tree(self, max_items: int = 15) -> Tree:
         """Build a Rich tree showing URL hierarchy."""
-        tree = Tree(f"[bold]{self._truncate_url(self.root_url)}[/bold]")
+        tree = Tree(f"[bold]{_truncate_url(self.root_url)}[/bold]")
 
-        def add_children(parent_tree: Tree, parent_url: str, depth: int = 0, count: int = 0) -> int:
+        def add_children(parent_tree: Tree, parent_id: int, depth: int = 0, count: int = 0) -> int:
             if depth > 3 or count >= max_items:  # Limit depth and items
                 return count
 
-            children = self._url_tree.get(parent_url, [])
-            for child_url in children[:5]:  # Max 5 children per node
+            children = self._children[parent_id]
+            for child_id in children[:5]:  # Max 5 children per node
                 if count >= max_items:
                     break
 
-                page = self.pages.get(child_url)
+                # URL strings are resolved only at render time
+                page = self.pages.get(self._urls[child_id])
                 if page:
-                    status_icon = self._get_status_icon(page.status)
-                    label = f"{status_icon} {self._truncate_url(child_url, 50)}"
-
-                    if page.title and page.status == PageStatus.SUCCESS:
-                        label = f"{status_icon} {page.title[:40]}"
-
-                    child_tree = parent_tree.add(label)
-                    count = add_children(child_tree, child_url, depth + 1, count + 1)
+                    child_tree = parent_tree.add(page.display_label)
+                    count = add_children(child_tree, child_id, depth + 1, count + 1)
 
             if len(children) > 5:
                 parent_tree.add(f"[dim]... and {len(children) - 5} more[/dim]")
 
             return count
 
-        add_children(tree, self.root_url)
+        root_id = self._url_to_id.get(self.root_url)
+        if root_id is not None:
+            add_children(tree, root_id)
         return tree
 
     def _get_recent_activity(self, limit: int = 5) -> Table:
@@ -253,49 +375,21 @@ class CrawlerVisualizer:
         table.add_column("URL", overflow="ellipsis")
         table.add_column("Links", justify="right", width=6)
 
-        # Get pages sorted by some recent activity indicator
-        recent_pages = sorted(
-            self.pages.values(),
-            key=lambda p: (p.status != PageStatus.CRAWLING, p.depth),
-        )[:limit]
-
-        for page in recent_pages:
+        # Newest updates first, straight from the bounded deque
+        for page in list(self._recent)[:limit]:
             status_text = self._get_status_text(page.status)
             links = str(page.links_found) if page.links_found else "-"
-            table.add_row(status_text, self._truncate_url(page.url, 60), links)
+            table.add_row(status_text, _truncate_url(page.url, 60), links)
 
         return table
 
     def _get_status_icon(self, status: PageStatus) -> str:
         """Get icon for page status."""
-        icons = {
-            PageStatus.PENDING: "[yellow]○[/yellow]",
-            PageStatus.CRAWLING: "[cyan]◉[/cyan]",
-            PageStatus.SUCCESS: "[green]✓[/green]",
-            PageStatus.FAILED: "[red]✗[/red]",
-            PageStatus.SKIPPED: "[dim]○[/dim]",
-        }
-        return icons.get(status, "○")
+        return _STATUS_ICONS[status]
 
     def _get_status_text(self, status: PageStatus) -> str:
         """Get colored status text."""
-        texts = {
-            PageStatus.PENDING: "[yellow]Pending[/yellow]",
-            PageStatus.CRAWLING: "[cyan]Crawling[/cyan]",
-            PageStatus.SUCCESS: "[green]Done[/green]",
-            PageStatus.FAILED: "[red]Failed[/red]",
-            PageStatus.SKIPPED: "[dim]Skipped[/dim]",
-        }
-        return texts.get(status, "Unknown")
-
-    def _truncate_url(self, url: str, max_len: int = 40) -> str:
-        """Truncate URL for display."""
-        parsed = urlparse(url)
-        path = parsed.path or "/"
-
-        if len(path) > max_len:
-            return f"...{path[-(max_len-3):]}"
-        return path
+        return _STATUS_TEXTS[status]
 
     async def print_summary(self) -> None:
         """Print final summary."""